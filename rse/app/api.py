@@ -21,12 +21,12 @@ def list_repos(parser=None):
     """
     repos = []
     url = (RSE_HOST or flask.request.host_url) + RSE_URL_PREFIX
-    for i, repo in enumerate(app.client.list(parser)):
+    for i, uid in enumerate(app.client.list(parser)):
         repos.append(
             {
-                "uid": repo[0],
-                "html_url": "%srepository/%s" % (url, repo[0]),
-                "api_url": "%sapi/repos/%s" % (url, repo[0]),
+                "uid": uid,
+                "html_url": "%srepository/%s" % (url, uid),
+                "api_url": "%sapi/repos/%s" % (url, uid),
             }
         )
     return repos
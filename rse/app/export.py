@@ -94,8 +94,8 @@ def export_web_static(export_dir, base_url, client, force=False, p=None):
     data = []
 
     # Add repos and static annotation
-    for repo in client.list():
-        repo = client.get(repo[0])
+    for uid in client.list():
+        repo = client.get(uid)
         repo_path = os.path.join("repository", repo.uid)
 
         if isinstance(repo.data, str):
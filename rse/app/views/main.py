@@ -36,10 +36,10 @@ def topics_view():
 
     topics = app.client.topics()
     repos = []
-    for name in app.client.list():
+    for uid in app.client.list():
 
         # Obtain the repository and load the data.
-        repo = app.client.get(name[0])
+        repo = app.client.get(uid)
         repo.parser.load(repo.data)
         repos.append(repo.load())
 
@@ -79,8 +79,8 @@ def criteria_view():
 def search():
     repos = []
     url = RSE_HOST + RSE_URL_PREFIX or flask.request.host_url + RSE_URL_PREFIX
-    for i, name in enumerate(app.client.list()):
-        repo = app.client.get(name[0])
+    for i, uid in enumerate(app.client.list()):
+        repo = app.client.get(uid)
         repos.append(
             {
                 "uid": repo.uid,
@@ -0,0 +1,753 @@
+#!/usr/bin/env python
+
+"""
+
+Copyright (C) 2020-2022 Vanessa Sochat.
+
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL was not distributed
+with this file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+
+import argparse
+import functools
+import importlib
+import logging
+import os
+import sys
+
+# Global options that take a value, skipped when sniffing the subcommand
+GLOBAL_VALUE_OPTIONS = ["--log_level", "--config_file"]
+
+
+def _is_help_flag(arg):
+    """determine if a command line argument asks for help the way argparse
+    would see it: -h, any abbreviation of --help (e.g., --he), or a cluster
+    of short flags that includes h (e.g., -ah).
+
+    Arguments:
+     - arg (str) : a single command line argument
+    """
+    if arg.startswith("--"):
+        name = arg.partition("=")[0]
+        return len(name) > 2 and "--help".startswith(name)
+    return arg.startswith("-") and "h" in arg[1:]
+
+
+def _sniff_subcommand(argv):
+    """sniff the subcommand from a list of command line arguments, skipping
+    over global options (and their values). We return None if a help flag
+    comes before the subcommand, or if no subcommand is found.
+
+    Arguments:
+     - argv (list) : command line arguments, without the executable
+    """
+    skip = False
+    for arg in argv:
+        if skip:
+            skip = False
+            continue
+        if _is_help_flag(arg):
+            return None
+        if arg in GLOBAL_VALUE_OPTIONS:
+            skip = True
+            continue
+        if arg.startswith("-"):
+            continue
+        return arg
+
+
+# Commands simple enough to parse by hand, with their options (that take
+# a value) and flags, each mapped to the argparse dest
+FAST_COMMANDS = {
+    "add": {"options": {"--database": "database", "--file": "file"}, "flags": {}},
+    "exists": {"options": {"--database": "database"}, "flags": {}},
+    "get": {"options": {"--database": "database"}, "flags": {}},
+    "update": {
+        "options": {
+            "--database": "database",
+            "--file": "file",
+            "-p": "path",
+            "--path": "path",
+        },
+        "flags": {"--force": "force", "--rewrite": "rewrite"},
+    },
+}
+
+
+def _fast_parse(argv):
+    """parse simple invocations of the commands in FAST_COMMANDS without
+    building the argparse parser, e.g., rse --config_file rse.ini get <uid>.
+    We return None for anything else (help, unknown or invalid arguments)
+    so the caller can fall back to argparse, which stays the authority.
+
+    Arguments:
+     - argv (list) : command line arguments, without the executable
+    """
+    from rse.defaults import RSE_CONFIG_FILE
+    from rse.logger import RSE_LOG_LEVEL, RSE_LOG_LEVELS
+
+    # Help (even abbreviated) is always left to argparse
+    if any(_is_help_flag(arg) for arg in argv):
+        return
+
+    values = {"log_level": RSE_LOG_LEVEL, "config_file": RSE_CONFIG_FILE}
+    argv = list(argv)
+
+    # Global options come before the command
+    while argv and argv[0].startswith("-"):
+        name, sep, value = argv.pop(0).partition("=")
+        if name not in GLOBAL_VALUE_OPTIONS:
+            return
+        if not sep:
+            if not argv or argv[0].startswith("-"):
+                return
+            value = argv.pop(0)
+        values[name.lstrip("-")] = value
+
+    if not argv or argv[0] not in FAST_COMMANDS:
+        return
+    if values["log_level"] not in RSE_LOG_LEVELS:
+        return
+
+    command = argv.pop(0)
+    options = FAST_COMMANDS[command]["options"]
+    flags = FAST_COMMANDS[command]["flags"]
+    for dest in list(options.values()) + ["uid"]:
+        values[dest] = None
+    for dest in flags.values():
+        values[dest] = False
+
+    # Command options, flags, and (at most) one uid, in any order
+    uid_found = False
+    while argv:
+        arg = argv.pop(0)
+        name, sep, value = arg.partition("=")
+        if name in options:
+            if not sep:
+                if not argv or argv[0].startswith("-"):
+                    return
+                value = argv.pop(0)
+            values[options[name]] = value
+        elif arg in flags:
+            values[flags[arg]] = True
+        elif arg.startswith("-") or uid_found:
+            return
+        else:
+            values["uid"] = arg
+            uid_found = True
+
+    if values["database"] not in [None, "filesystem", "sqlite"]:
+        return
+    return argparse.Namespace(command=command, version=False, **values)
+
+
+def get_parser():
+    """get the parser for the command line arguments. The parser depends on
+    the subcommand and help flags in sys.argv, so we cache one for each.
+    """
+    # The -h/--help flags are only added when help could be shown
+    show_help = len(sys.argv) == 1 or any(_is_help_flag(arg) for arg in sys.argv)
+
+    # Only build the subparser that was asked for, or all of them for help
+    command = _sniff_subcommand(sys.argv[1:])
+    if command not in SUBPARSER_BUILDERS:
+        command = None
+    return _build_parser(command, show_help)
+
+
+def _reset_cached_parser():
+    """clear the cached parsers, e.g., for tests that need them rebuilt"""
+    _build_parser.cache_clear()
+
+
+@functools.lru_cache(maxsize=None)
+def _build_parser(command=None, show_help=True):
+    """build the parser with a single subcommand (or all of them, if command
+    is None). Use get_parser instead of calling this directly.
+    """
+    from rse.defaults import RSE_CONFIG_FILE
+    from rse.logger import RSE_LOG_LEVEL, RSE_LOG_LEVELS
+
+    parser = argparse.ArgumentParser(
+        description="Research software engineering software inspector.",
+        add_help=show_help,
+    )
+
+    parser.add_argument(
+        "--version",
+        dest="version",
+        help="suppress additional output.",
+        default=False,
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "--log_level",
+        dest="log_level",
+        choices=RSE_LOG_LEVELS,
+        default=RSE_LOG_LEVEL,
+        help="Customize logging level for rse inspector.",
+    )
+
+    # Configuration file
+    parser.add_argument(
+        "--config_file",
+        dest="config_file",
+        default=RSE_CONFIG_FILE,
+        help="Path to rse.ini configuration file.",
+    )
+
+    description = "actions for rse"
+    subparsers = parser.add_subparsers(
+        help="rse actions",
+        title="actions",
+        description=description,
+        dest="command",
+        parser_class=functools.partial(argparse.ArgumentParser, add_help=show_help),
+    )
+
+    # print version and exit
+    subparsers.add_parser("version", help="show software version")
+
+    if command is not None:
+        SUBPARSER_BUILDERS[command](subparsers)
+    else:
+        for build in SUBPARSER_BUILDERS.values():
+            build(subparsers)
+    return parser
+
+
+def add_database_argument(command):
+    """Most commands allow specification of a database backend"""
+    command.add_argument(
+        "--database",
+        dest="database",
+        choices=["filesystem", "sqlite"],
+        default=None,
+        help="database backend to use, to override configuration.",
+    )
+
+
+def add_uid_argument(command, add_file=False):
+    """add the software uid, and (optionally) a file of uids"""
+    command.add_argument("uid", help="uri within software namespace.", nargs="?")
+    if add_file:
+        command.add_argument(
+            "--file",
+            dest="file",
+            default=None,
+            help="single line delimited file of repositories.",
+        )
+
+
+def add_server_arguments(command):
+    """add arguments for commands that run (or render) the dashboard"""
+    command.add_argument(
+        "--port",
+        dest="port",
+        default=5000,
+        type=int,
+        help="select port to run dashboard on (defaults to 5000)",
+    )
+    command.add_argument(
+        "--host",
+        dest="host",
+        default="127.0.0.1",
+        type=str,
+        help="the hostname to run for the server (defaults to 127.0.0.1)",
+    )
+    command.add_argument(
+        "--debug",
+        dest="debug",
+        help="run server in debug mode (defaults to False)",
+        default=False,
+        action="store_true",
+    )
+    command.add_argument(
+        "--disable-annotate",
+        dest="disable_annotate",
+        help="disable annotation button (defaults to False)",
+        default=False,
+        action="store_true",
+    )
+
+
+def _build_annotate(subparsers):
+    """Annotate criteria or taxonomy"""
+    annotate = subparsers.add_parser(
+        "annotate", help="Annotate a database with criteria or taxonomy"
+    )
+    annotate.add_argument(
+        "type",
+        help="Type to annotate (taxonomy or criteria)",
+        nargs=1,
+        choices=["taxonomy", "criteria"],
+    )
+    annotate.add_argument(
+        "-u",
+        "--username",
+        dest="username",
+        default=None,
+        help="GitHub username (must be provided if not available with git config)",
+    )
+    annotate.add_argument(
+        "-r",
+        "--repo",
+        dest="repo",
+        default=None,
+        help="Specify a particular repository name to annotate.",
+    )
+    annotate.add_argument(
+        "-f",
+        "--file",
+        dest="file",
+        default=None,
+        help="Read annotation from file (e.g., markdown list, GitHub issue template).",
+    )
+    annotate.add_argument(
+        "--all",
+        "-a",
+        dest="all_repos",
+        help="Annotate all repos, even those that have already been seen (defaults to show only those unseen).",
+        default=False,
+        action="store_true",
+    )
+    add_database_argument(annotate)
+
+
+def _build_generate_key(subparsers):
+    """Generate a key for the interface"""
+    subparsers.add_parser(
+        "generate-key",
+        help="generate a key for rse start, should be exported to RSE_SERVER_KEY.",
+    )
+
+
+def _build_init(subparsers):
+    """Init"""
+    init = subparsers.add_parser(
+        "init", help="Add an rse.ini to the present working directory."
+    )
+    init.add_argument(
+        "path",
+        help="Path to generate rse.ini file",
+        nargs="?",
+        default=".",
+    )
+    add_database_argument(init)
+
+
+def _build_config(subparsers):
+    """Config"""
+    config = subparsers.add_parser(
+        "config", help="Update an rse.ini configuration file."
+    )
+    add_database_argument(config)
+
+
+def _build_clear(subparsers):
+    """Clear"""
+    clear = subparsers.add_parser("clear", help="Remove software from the database.")
+    clear.add_argument("target", nargs="?")
+    clear.add_argument(
+        "--force",
+        dest="force",
+        help="Don't ask for confirmation for delete (for headless).",
+        default=False,
+        action="store_true",
+    )
+    add_database_argument(clear)
+
+
+def _build_exists(subparsers):
+    """Exists"""
+    exists = subparsers.add_parser(
+        "exists", help="Determine if an entry exists in the database."
+    )
+    add_database_argument(exists)
+    add_uid_argument(exists)
+
+
+def _build_export(subparsers):
+    """Export"""
+    export = subparsers.add_parser(
+        "export", help="Export repository names, metadata, or static files."
+    )
+    export.add_argument(
+        "--type",
+        dest="export_type",
+        help="Type to export (defaults to repos.txt list)",
+        default="repos-txt",
+        choices=["repos-txt", "static-web", "jekyll-web"],
+    )
+    export.add_argument(
+        "--force",
+        dest="force",
+        help="Don't ask for confirmation to overwrite existing file(s).",
+        default=False,
+        action="store_true",
+    )
+    export.add_argument(
+        "path",
+        help="Fileame to export repos to (default repos.txt)",
+        default="repos.txt",
+    )
+    add_server_arguments(export)
+    add_database_argument(export)
+
+
+def _build_import(subparsers):
+    """Import"""
+    imp = subparsers.add_parser("import", help="Import from a known source.")
+    imp.add_argument(
+        "--type",
+        dest="import_type",
+        help="Type to import (defaults to google-sheet)",
+        default="google-sheet",
+        choices=["google-sheet", "csv"],
+    )
+
+    imp.add_argument(
+        "--dry-run",
+        dest="dry_run",
+        help="Dump import output to the terminal, but don't create new repos.",
+        default=False,
+        action="store_true",
+    )
+    imp.add_argument(
+        "-u",
+        "--update",
+        help="Given the record exists, update it.",
+        default=False,
+        action="store_true",
+    )
+    add_database_argument(imp)
+
+
+def _build_summary(subparsers):
+    """Summary metrics for all repositories"""
+    summary = subparsers.add_parser(
+        "summary", help="View summary metrics for all repositories."
+    )
+    summary.add_argument(
+        "--type",
+        dest="metric_type",
+        help="Metric type to view.",
+        default="summary",
+        choices=["criteria", "taxonomy", "users"],
+    )
+    summary.add_argument(
+        "repo", help="Filter down to one repository.", default=None, nargs="?"
+    )
+    add_database_argument(summary)
+
+
+def _build_analyze(subparsers):
+    """Metrics for a specific repository"""
+    analyze = subparsers.add_parser(
+        "analyze", help="View metrics for a specific repository."
+    )
+    analyze.add_argument(
+        "repo",
+        help="Software repository to show",
+        default=None,
+    )
+    analyze.add_argument(
+        "--ct",
+        "--cthresh",
+        dest="cthresh",
+        help="Criteria threshold (between 0 and 1)",
+        default=0.5,
+        type=percentage_type_asint,
+    )
+    analyze.add_argument(
+        "--tt",
+        "--tthresh",
+        dest="tthresh",
+        help="Minimum taxonomy votes to count category in response",
+        default=1,
+        type=positive_int_type,
+    )
+    add_database_argument(analyze)
+
+
+def _build_update(subparsers):
+    """Update"""
+    update = subparsers.add_parser(
+        "update", help="Update one or more software entries."
+    )
+
+    update.add_argument(
+        "-p",
+        "--path",
+        dest="path",
+        default=None,
+        help="Path to single folder or set of folders to update.",
+    )
+    update.add_argument(
+        "--force",
+        dest="force",
+        help="If a repository is not present, add it.",
+        default=False,
+        action="store_true",
+    )
+    update.add_argument(
+        "--rewrite",
+        dest="rewrite",
+        help="If data exists, don't update but rewrite.",
+        default=False,
+        action="store_true",
+    )
+    add_database_argument(update)
+    add_uid_argument(update, add_file=True)
+
+
+def _build_topics(subparsers):
+    """List topics (global) or matching pattern"""
+    topics = subparsers.add_parser(
+        "topics", help="List software topics (GitHub support only)"
+    )
+    topics.add_argument(
+        "--pattern",
+        help="filter topics to a particular pattern",
+        type=str,
+        default=None,
+    )
+    topics.add_argument(
+        "--search",
+        help="find repositories based on a list of topics",
+        type=str,
+        nargs="*",
+    )
+    add_database_argument(topics)
+
+
+def _build_ls(subparsers):
+    """List repos and print to terminal"""
+    ls = subparsers.add_parser("ls", help="List software")
+    ls.add_argument(
+        "parser", help="list one or more parsers or specific software.", nargs="*"
+    )
+    add_database_argument(ls)
+
+
+def _build_search(subparsers):
+    """Search for software"""
+    search = subparsers.add_parser(
+        "search",
+        help="Search for a piece of research software",
+    )
+    search.add_argument("query", nargs="*")
+    search.add_argument("--taxonomy", nargs="*")
+    search.add_argument("--criteria", nargs="*")
+    add_database_argument(search)
+
+
+def _build_scrape(subparsers):
+    """Scrape for new repos"""
+    scrape = subparsers.add_parser(
+        "scrape",
+        help="Add new software repositories from a resource.",
+    )
+    scrape.add_argument("scraper_name", nargs=1)
+    scrape.add_argument("query", nargs="?")
+    scrape.add_argument(
+        "--dry-run",
+        dest="dry_run",
+        help="Dump scrape output to the terminal, but don't create new repos.",
+        default=False,
+        action="store_true",
+    )
+    scrape.add_argument(
+        "--delay",
+        dest="delay",
+        help="Number of seconds (float) to delay, default 0.",
+        type=float_type,
+        default=0.0,
+    )
+    add_database_argument(scrape)
+
+
+def _build_shell(subparsers):
+    """Shell"""
+    subparsers.add_parser(
+        "shell", help="start an interactive shell for an encyclopedia"
+    )
+
+
+def _build_start(subparsers):
+    """Start the rse dashboard"""
+    start = subparsers.add_parser(
+        "start", help="start an interface to browse software (requires Flask)"
+    )
+    add_server_arguments(start)
+    add_database_argument(start)
+
+
+def _build_label(subparsers):
+    """Label a repository with metadata, e.g., add a DOI."""
+    label = subparsers.add_parser(
+        "label", help="Add a metadata value for an existing repository"
+    )
+    label.add_argument("values", nargs=3)
+    label.add_argument(
+        "--force",
+        dest="force",
+        help="Overwrite existing label, if it exists.",
+        default=False,
+        action="store_true",
+    )
+    add_database_argument(label)
+
+
+def _build_get(subparsers):
+    """Print complete metadata for a specific piece of software"""
+    get = subparsers.add_parser("get", help="Show metadata for software")
+    add_database_argument(get)
+    add_uid_argument(get)
+
+
+def _build_add(subparsers):
+    """Add a repository to the database"""
+    add = subparsers.add_parser("add", help="Add a repository to the database.")
+    add_database_argument(add)
+    add_uid_argument(add, add_file=True)
+
+
+# Client modules (and entrypoint functions) to import for each command
+COMMAND_MODULES = {
+    "analyze": ("rse.client.metrics", "analyze"),
+    "annotate": ("rse.client.annotate", "main"),
+    "add": ("rse.client.add", "main"),
+    "clear": ("rse.client.clear", "main"),
+    "config": ("rse.client.config", "main"),
+    "exists": ("rse.client.exists", "main"),
+    "export": ("rse.client.export", "main"),
+    "generate-key": ("rse.client.generate", "main"),
+    "import": ("rse.client.imp", "main"),
+    "label": ("rse.client.label", "main"),
+    "update": ("rse.client.update", "main"),
+    "get": ("rse.client.get", "main"),
+    "init": ("rse.client.init", "main"),
+    "ls": ("rse.client.listing", "main"),
+    "summary": ("rse.client.metrics", "summary"),
+    "search": ("rse.client.search", "main"),
+    "scrape": ("rse.client.scrape", "main"),
+    "shell": ("rse.client.shell", "main"),
+    "start": ("rse.client.start", "main"),
+    "topics": ("rse.client.topics", "main"),
+}
+
+# Subparser builders, in the order they are shown in the help
+SUBPARSER_BUILDERS = {
+    "annotate": _build_annotate,
+    "generate-key": _build_generate_key,
+    "init": _build_init,
+    "config": _build_config,
+    "clear": _build_clear,
+    "exists": _build_exists,
+    "export": _build_export,
+    "import": _build_import,
+    "summary": _build_summary,
+    "analyze": _build_analyze,
+    "update": _build_update,
+    "topics": _build_topics,
+    "ls": _build_ls,
+    "search": _build_search,
+    "scrape": _build_scrape,
+    "shell": _build_shell,
+    "start": _build_start,
+    "label": _build_label,
+    "get": _build_get,
+    "add": _build_add,
+}
+
+
+def percentage_type_asint(arg):
+    """ensure that an input is between 0 and 1"""
+    try:
+        number = float(arg)
+    except ValueError:
+        raise argparse.ArgumentTypeError("Must be a floating point number")
+    if number < 0 or number > 1:
+        raise argparse.ArgumentTypeError("Argument must be between 0 and 1")
+    return number
+
+
+def float_type(arg):
+    """ensure that an input is greater than 0 and a float"""
+    try:
+        number = float(arg)
+    except ValueError:
+        raise argparse.ArgumentTypeError("Must be a floating point number")
+    if number < 0:
+        raise argparse.ArgumentTypeError("Argument must be greater than 0.")
+    return number
+
+
+def positive_int_type(arg):
+    """ensure user is providing a positive integer"""
+    value = int(arg)
+    if value < 0:
+        raise argparse.ArgumentTypeError(
+            "%s is an invalid positive integer value" % arg
+        )
+    return value
+
+
+def main():
+    """main entrypoint for rse"""
+    import rse
+
+    # Show the version and exit before we pay for building the parser
+    if len(sys.argv) >= 2 and sys.argv[1] in ["version", "--version"]:
+        print(rse.__version__)
+        sys.exit(0)
+
+    def help(return_code=0):
+        """print help, including the software version and active client
+        and exit with return code.
+        """
+        version = rse.__version__
+
+        print("\nResearch Software Engineering software inspector v%s" % version)
+        _build_parser(show_help=True).print_help()
+        sys.exit(return_code)
+
+    # If the user didn't provide any arguments, show the full help
+    if len(sys.argv) == 1:
+        help()
+
+    # Simple invocations of common commands don't need argparse
+    args = _fast_parse(sys.argv[1:])
+    extra = []
+
+    # If an error occurs while parsing the arguments, the interpreter will exit with value 2
+    if args is None:
+        args, extra = get_parser().parse_known_args()
+
+    # Set the logging level, which loggers (e.g., rse.client) inherit from root
+    from rse.logger import RSE_LOG_LEVEL
+
+    if args.log_level != RSE_LOG_LEVEL:
+        os.putenv("RSE_LOG_LEVEL", args.log_level)
+    logging.basicConfig(level=getattr(logging, args.log_level))
+
+    # Show the version and exit
+    if args.command == "version" or args.version:
+        print(rse.__version__)
+        sys.exit(0)
+
+    # Look up the client module (and function) for the command
+    if args.command not in COMMAND_MODULES:
+        help(1)
+    module, function = COMMAND_MODULES[args.command]
+
+    # Pass on to the correct parser
+    getattr(importlib.import_module(module), function)(args=args, extra=extra)
+
+
+if __name__ == "__main__":
+    main()
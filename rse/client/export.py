@@ -10,7 +10,6 @@ with this file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 import logging
 import os
-from multiprocessing import Process
 
 from rse.main import Encyclopedia
 from rse.utils.file import write_file
@@ -30,7 +29,7 @@ def main(args, extra):
     if args.export_type == "repos-txt":
 
         # We just want the unique id, the first result
-        repos = [x[0] for x in client.list()]
+        repos = list(client.list())
         write_file("\n".join(repos), args.path)
         bot.info(f"Wrote {len(repos)} to {args.path}")
 
@@ -40,6 +39,8 @@ def main(args, extra):
 
     # Static web export from flask to a directory
     elif args.export_type == "static-web":
+        from multiprocessing import Process
+
         from rse.app.export import export_web_static
         from rse.app.server import start
 
@@ -19,8 +19,8 @@ def main(args, extra):
 
     # Case 1: empty list indicates listing all
     if not args.parser:
-        bot.table(enc.list())
+        bot.table([[uid] for uid in enc.list()])
     else:
         # Each in the list can be a full executor or a uid
         for parser in args.parser:
-            bot.table(enc.list(parser))
+            bot.table([[uid] for uid in enc.list(parser)])
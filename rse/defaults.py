@@ -9,13 +9,10 @@ with this file, You can obtain one at http://mozilla.org/MPL/2.0/.
 """
 
 import logging
-import multiprocessing
 import os
 
 from rse.exceptions import MissingEnvironmentVariable
-from rse.logger import RSE_LOG_LEVEL
 
-logging.basicConfig(level=getattr(logging, RSE_LOG_LEVEL))
 bot = logging.getLogger("rse.defaults")
 
 
@@ -39,34 +36,76 @@ def getenv(variable_key, default=None, required=False, silent=True):
     return variable
 
 
-RSE_NPROC = multiprocessing.cpu_count()
-RSE_WORKERS = int(getenv("RSE_WORKERS", RSE_NPROC * 2 + 1))
-RSE_SHELL = getenv("RSE_SHELL", "ipython")
-RSE_CONFIG_FILE = getenv("RSE_CONFIG_FILE", "rse.ini")
-RSE_CUSTOM_DATABASE_DIR = getenv("RSE_CUSTOM_DATABASE_DIR", "custom")
+# Parsers installed
+RSE_PARSERS = ["github"]
 
-# Default database is filesystem
-RSE_DATABASE = getenv("RSE_DATABASE")
+# Environment variables (and fallbacks) that are resolved on first access
+ENVIRONMENT_DEFAULTS = {
+    "RSE_SHELL": "ipython",
+    "RSE_CONFIG_FILE": "rse.ini",
+    "RSE_CUSTOM_DATABASE_DIR": "custom",
+    # Default database is filesystem
+    "RSE_DATABASE": None,
+    # Default taxonomy and criteria endpoints, and place to post annotation issues
+    "RSE_API_ENDPOINT": "https://rseng.github.io/rseng/api",
+    "RSE_ISSUE_ENDPOINT": "https://github.com/rseng/software",
+    # Dashboard settings
+    "RSE_HOSTNAME": "127.0.0.1",
+}
 
-# Database folder for filesystem or sqlite database
-RSE_DATABASE_STRING = os.environ.get("RSE_DATABASE")
 
-# Parsers installed
-RSE_PARSERS = ["github"]
+def get_nproc():
+    import multiprocessing
+
+    return multiprocessing.cpu_count()
+
+
+def get_workers():
+    return int(getenv("RSE_WORKERS", __getattr__("RSE_NPROC") * 2 + 1))
+
+
+def get_database_string():
+    """Database folder for filesystem or sqlite database"""
+    return os.environ.get("RSE_DATABASE")
 
-# Default taxonomy and criteria endpoints, and place to post annotation issues
-RSE_API_ENDPOINT = getenv("RSE_API_ENDPOINT", "https://rseng.github.io/rseng/api")
-RSE_ISSUE_ENDPOINT = getenv("RSE_ISSUE_ENDPOINT", "https://github.com/rseng/software")
-RSE_HOST = getenv("RSE_HOST")
-if RSE_HOST and RSE_HOST.endswith("/"):
-    RSE_HOST = RSE_HOST.rstrip("/")
-
-# MUST start and end with slash
-RSE_URL_PREFIX = getenv("RSE_URL_PREFIX", "/")
-if not RSE_URL_PREFIX.startswith("/"):
-    RSE_URL_PREFIX = "/%s" % RSE_URL_PREFIX
-if not RSE_URL_PREFIX.endswith("/"):
-    RSE_URL_PREFIX = "%s/" % RSE_URL_PREFIX
-
-# Dashboard settings
-RSE_HOSTNAME = getenv("RSE_HOSTNAME", "127.0.0.1")
+
+def get_host():
+    host = getenv("RSE_HOST")
+    if host and host.endswith("/"):
+        host = host.rstrip("/")
+    return host
+
+
+def get_url_prefix():
+    """MUST start and end with slash"""
+    prefix = getenv("RSE_URL_PREFIX", "/")
+    if not prefix.startswith("/"):
+        prefix = "/%s" % prefix
+    if not prefix.endswith("/"):
+        prefix = "%s/" % prefix
+    return prefix
+
+
+# Defaults that need more than a lookup, also resolved on first access
+DEFAULT_GETTERS = {
+    "RSE_NPROC": get_nproc,
+    "RSE_WORKERS": get_workers,
+    "RSE_DATABASE_STRING": get_database_string,
+    "RSE_HOST": get_host,
+    "RSE_URL_PREFIX": get_url_prefix,
+}
+
+
+def __getattr__(name):
+    """
+    Resolve a default the first time it is requested, and cache it on the
+    module so later lookups don't come back here.
+    """
+    if name in DEFAULT_GETTERS:
+        value = DEFAULT_GETTERS[name]()
+    elif name in ENVIRONMENT_DEFAULTS:
+        value = getenv(name, ENVIRONMENT_DEFAULTS[name])
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
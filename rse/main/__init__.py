@@ -13,22 +13,13 @@ import logging
 import os
 import re
 
-import rse.main.export
-from rse.defaults import RSE_CONFIG_FILE, RSE_DATABASE, RSE_PARSERS
+import rse.defaults
 from rse.exceptions import RepoMetadataExistError, RepoNotFoundError
-from rse.logger.message import bot as message
 from rse.main.config import Config
-from rse.main.criteria import get_criteria
 from rse.main.database import init_db
-from rse.main.parsers import get_parser
-from rse.main.taxonomy import get_taxonomy
-from rse.utils.command import get_github_username
-from rse.utils.file import read_file
-from rse.utils.prompt import choice_prompt, confirm
 from rse.utils.urls import repository_regex
 
 bot = logging.getLogger("rse.main")
-parser_regex = "github"
 
 
 class Encyclopedia:
@@ -38,14 +29,21 @@ class Encyclopedia:
     however an sqlite database (or other) can be used.
     """
 
+    __slots__ = ("config", "config_dir", "database", "db", "criteria", "taxonomy")
+
     def __init__(self, config_file=None, database=None, generate=False):
         """
         create a software repository. We take a config file, which should
         sit at the root of the repository, and then parse the subfolders
-        accordingly.
+        accordingly. The client always provides the config_file, so the
+        default (RSE_CONFIG_FILE) is only resolved for direct use.
         """
-        self.config = Config(config_file or RSE_CONFIG_FILE, generate=generate)
+        self.config = Config(
+            config_file or rse.defaults.RSE_CONFIG_FILE, generate=generate
+        )
         self.config_dir = os.path.dirname(self.config.configfile)
+        self.criteria = None
+        self.taxonomy = None
         self.initdb(database)
 
     def initdb(self, database):
@@ -60,7 +58,7 @@ class Encyclopedia:
         """
         self.database = (
             database
-            or RSE_DATABASE
+            or rse.defaults.RSE_DATABASE
             or self.config.get("DEFAULT", "database")
             or "filesystem"
         )
@@ -88,6 +86,8 @@ class Encyclopedia:
         based on a parser type and unique identifier, determine if software
         exists in the database
         """
+        from rse.main.parsers import get_parser
+
         parser = get_parser(uid, config=self.config)
         return self.db.exists(parser.uid)
 
@@ -95,7 +95,8 @@ class Encyclopedia:
         """
         A wrapper to the database list_repos function. Optionally take
         a whole parser name (e.g., github) or just a specific uid. No
-        parser indicates that we list everything.
+        parser indicates that we list everything. The uids are yielded
+        one at a time.
         """
         return self.db.list_repos(name)
 
@@ -103,7 +104,9 @@ class Encyclopedia:
         """
         Get a listing of criteria from the rse API
         """
-        if not hasattr(self, "criteria"):
+        from rse.main.criteria import get_criteria
+
+        if self.criteria is None:
             self.criteria = get_criteria()
         return self.criteria
 
@@ -111,7 +114,9 @@ class Encyclopedia:
         """
         Get a listing of a flattened taxonomy from the rse API
         """
-        if not hasattr(self, "taxonomy"):
+        from rse.main.taxonomy import get_taxonomy
+
+        if self.taxonomy is None:
             self.taxonomy = get_taxonomy()
         return self.taxonomy
 
@@ -119,25 +124,31 @@ class Encyclopedia:
         """
         Given a filename with a single list of repos, add each
         """
+        from rse.utils.file import stream_file
+
         repos = []
         if os.path.exists(filename):
-            for name in read_file(filename):
-                uid = name.strip()
-                repos += [self.add(uid, quiet=True)] or []
+            for name in stream_file(filename):
+                repo = self.add(name.strip(), quiet=True)
+                if repo is not None:
+                    repos.append(repo)
         return repos
 
     def bulk_update(self, filename, rewrite=False):
         """
         Given a filename with a single list of repos, add each
         """
+        from rse.utils.file import stream_file
+
         repos = []
         if os.path.exists(filename):
-            for name in read_file(filename):
-                uid = name.strip()
+            for name in stream_file(filename):
                 try:
-                    repos += [self.update(uid, rewrite=rewrite)]
+                    repo = self.update(name.strip(), rewrite=rewrite)
                 except RepoNotFoundError:
-                    pass
+                    continue
+                if repo is not None:
+                    repos.append(repo)
         return repos
 
     def add(self, uid, quiet=False, data=None):
@@ -165,6 +176,8 @@ class Encyclopedia:
         clear takes a target, and that can be a uid, parser, or none
         We ask the user for confirmation.
         """
+        from rse.utils.prompt import confirm
+
         # Case 1: no target indicates clearing all
         if not target:
             if noprompt or confirm(
@@ -173,14 +186,14 @@ class Encyclopedia:
                 return self.db.clear()
 
         # Case 2: it's a parser
-        elif target in RSE_PARSERS:
+        elif target in rse.defaults.RSE_PARSERS:
             if noprompt or confirm(
                 f"This will delete all {target} software in the database, are you sure?"
             ):
                 return self.db.delete_parser(target)
 
-        # Case 3, it's a specific software identifier
-        elif re.search(parser_regex, target):
+        # Case 3, it's a specific software identifier (a literal match)
+        elif "github" in target:
             if noprompt or confirm(
                 f"This will delete software {target}, are you sure?"
             ):
@@ -235,9 +248,11 @@ class Encyclopedia:
         """
         yield repos, one at a time.
         """
-        for name in self.list():
+        from rse.main.parsers import get_parser
+
+        for uid in self.list():
             # The parser will provide consistent handles to avatar, description, etc.
-            repo = self.get(name[0])
+            repo = self.get(uid)
 
             # Relational needs to load from string
             data = repo.data
@@ -255,8 +270,8 @@ class Encyclopedia:
         return a list of unique topics, optionally matching a pattern
         """
         topics = set()
-        for name in self.list():
-            repo = self.get(name[0])
+        for uid in self.list():
+            repo = self.get(uid)
 
             # Relational needs to load from string
             data = repo.data
@@ -277,8 +292,8 @@ class Encyclopedia:
         return a list of unique topics, optionally matching a pattern
         """
         repos = []
-        for name in self.list():
-            repo = self.get(name[0])
+        for uid in self.list():
+            repo = self.get(uid)
             data = repo.parser.get_metadata()
             topiclist = data.get("topics", []) or data.get("data", {}).get("topics", [])
             if set(topics).intersection(set(topiclist)):
@@ -327,9 +342,9 @@ class Encyclopedia:
         thresholds
         """
         results = []
-        for repo in self.list():
+        for uid in self.list():
             result = self.analyze(
-                repo[0],
+                uid,
                 cthresh=cthresh,
                 tthresh=tthresh,
                 taxonomy_uids=taxonomy_uids,
@@ -347,6 +362,8 @@ class Encyclopedia:
         analyze takes a repository and calculates a "final answer" based on user provided
         thresholds
         """
+        from rse.main.parsers import get_parser
+
         # If taxonomy or criteria lists aren't defined, use all
         if not taxonomy_uids:
             taxonomy_uids = [x["uid"] for x in self.list_taxonomy()]
@@ -394,8 +411,10 @@ class Encyclopedia:
         """
         Export rsepedia to a path. If it does not exist, we start with template.
         """
+        from rse.main.export import get_exporter
+
         path = os.path.abspath(path)
-        exporter = rse.main.export.get_exporter(exporter)(path)
+        exporter = get_exporter(exporter)(path)
         return exporter.export(repos=self.yield_repos())
 
     def summary(self, repo=None):
@@ -403,12 +422,14 @@ class Encyclopedia:
         Summarize metrics for the entire database if uid is not defined,
         or one specific repository.
         """
+        from rse.main.parsers import get_parser
+
         if repo is None:
-            repos = self.list()
+            repos = list(self.list())
             metrics = {"repos": len(repos)}
         else:
             parser = get_parser(repo, config=self.config)
-            repos = [[parser.uid]]
+            repos = [parser.uid]
             metrics = {"repo": parser.uid}
 
         # Add taxonomy and criteria items
@@ -420,7 +441,7 @@ class Encyclopedia:
 
         # Count annotations for
         for repo in repos:
-            parser = get_parser(repo[0], config=self.config)
+            parser = get_parser(repo, config=self.config)
             repo = self.get(parser.uid)
 
             if not repo.criteria and not repo.taxonomy:
@@ -481,6 +502,8 @@ class Encyclopedia:
          - unseen_only (bool): annotate only items not seen by username
          - repo (str) : annotate a particular software repository
         """
+        from rse.utils.command import get_github_username
+
         # git config user.name
         if not username:
             username = get_github_username()
@@ -496,6 +519,9 @@ class Encyclopedia:
         A general helper (private)  function to import an annotation, meaning
         we parse a repository and return additional lines for parsing.
         """
+        from rse.main.parsers import get_parser
+        from rse.utils.file import read_file
+
         if not username or not input_file:
             raise RuntimeError(
                 "A username and input file are required to import annotation criteria."
@@ -571,17 +597,19 @@ class Encyclopedia:
         Given a username, repository, and preference for seen / unseen,
         yield a repository to annotate.
         """
+        from rse.main.parsers import get_parser
+
         if repo is None:
             repos = self.list()
         else:
             parser = get_parser(repo, config=self.config)
-            repos = [[parser.uid]]
+            repos = [parser.uid]
             unseen_only = False
 
         # yield combinations that don't exist yet, repo first to save changes
-        for name in repos:
-            repo = self.get(name[0])
-            for item in self.list_criteria():
+        items = self.list_criteria()
+        for repo in self.db.get_many(repos):
+            for item in items:
                 if unseen_only and not repo.has_criteria_annotation(
                     item["uid"], username
                 ):
@@ -594,16 +622,17 @@ class Encyclopedia:
         Given a username, repository, and preference for seen / unseen,
         yield a repository to annotate.
         """
+        from rse.main.parsers import get_parser
+
         if repo is None:
             repos = self.list()
         else:
             parser = get_parser(repo, config=self.config)
-            repos = [[parser.uid]]
+            repos = [parser.uid]
             unseen_only = False
 
         # yield combinations that don't exist yet, repo first to save changes
-        for name in repos:
-            repo = self.get(name[0])
+        for repo in self.db.get_many(repos):
             if unseen_only and not repo.has_taxonomy_annotation(username):
                 yield repo
             elif not unseen_only:
@@ -616,24 +645,31 @@ class Encyclopedia:
         a particular repository. If the repository is specified, unseen_only
         is assumed False.
         """
+        from rse.logger.message import bot as message
+        from rse.utils.prompt import choice_prompt
+
         annotations = {}
+        message_info = message.info
+
+        # Keep the uid of the last repository local, to compare each iteration
         last = None
+        last_uid = None
         for repo, criteria in self.yield_criteria_annotation_repos(
             username, unseen_only, repo
         ):
 
             # Only print repository if not seen yet
-            if not last or repo.uid != last.uid:
+            if repo.uid != last_uid:
 
                 # If we have a last repo, we need to save progress
-                if last is not None and save is True:
-                    self.save_criteria(last)
-
                 if last is not None:
-                    annotations[last.uid] = last.criteria
+                    if save is True:
+                        self.save_criteria(last)
+                    annotations[last_uid] = last.criteria
 
-                message.info(f"\n{repo.url} [{repo.description}]:")
+                message_info(f"\n{repo.url} [{repo.description}]:")
                 last = repo
+                last_uid = repo.uid
 
             response = choice_prompt(
                 criteria["name"],
@@ -648,11 +684,10 @@ class Encyclopedia:
             repo.update_criteria(criteria["uid"], username, response)
 
         # Save the last repository
-        if last is not None and save is True:
-            self.save_criteria(last)
-
         if last is not None:
-            annotations[last.uid] = last.criteria
+            if save is True:
+                self.save_criteria(last)
+            annotations[last_uid] = last.criteria
         return annotations
 
     def annotate_taxonomy(self, username, unseen_only=True, repo=None, save=False):
@@ -662,24 +697,34 @@ class Encyclopedia:
         a particular repository. If the repository is specified, unseen_only
         is assumed False.
         """
+        from rse.logger.message import bot as message
+        from rse.utils.prompt import choice_prompt
+
         annotations = {}
 
         # Retrieve the full taxonomy
         items = self.list_taxonomy()
-        choices = [str(i) for i, _ in enumerate(items)] + ["s", "S", "skip"]
-        prefix = "0:%s or s to skip" % (len(items) - 1)
+        items_len = len(items)
+        choices = [str(i) for i in range(items_len)] + ["s", "S", "skip"]
+        prefix = "0:%s or s to skip" % (items_len - 1)
+
+        # The menu is the same for every repository, so we format it once
+        menu_lines = [
+            "How would you categorize this software? [enter one or more numbers]"
+        ]
+        for i, t in enumerate(items):
+            example = t.get("example", "")
+            name = t.get("name", "")
+            if name and example:
+                menu_lines.append(f"[{i}] {name} ({example})")
+            elif name:
+                menu_lines.append(f"[{i}] {name}")
+        menu_text = "\n".join(menu_lines)
 
         for repo in self.yield_taxonomy_annotation_repos(username, unseen_only, repo):
 
             message.info(f"\n{repo.url} [{repo.description}]:")
-            print("How would you categorize this software? [enter one or more numbers]")
-            for i, t in enumerate(items):
-                example = t.get("example", "")
-                name = t.get("name", "")
-                if name and example:
-                    print(f"[{i}] {name} ({example})")
-                elif name:
-                    print(f"[{i}] {name}")
+            print(menu_text)
 
             response = choice_prompt(
                 "Please enter one or more numbers, separated by spaces",
@@ -691,12 +736,14 @@ class Encyclopedia:
             if response in ["s", "S", "skip"]:
                 continue
 
-            # Get the unique ids
-            uids = [
-                items[int(x)]["uid"]
-                for x in set(response.split(" "))
-                if int(x) < len(items)
-            ]
+            # Get the unique ids, in the order the user entered them
+            seen = set()
+            uids = []
+            for x in response.split():
+                index = int(x)
+                if index < items_len and index not in seen:
+                    seen.add(index)
+                    uids.append(items[index]["uid"])
 
             # Filesystem database we write filename to repository folder
             self.save_taxonomy(repo, username, uids)
@@ -8,6 +8,7 @@ with this file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 """
 
+import functools
 import logging
 import sys
 
@@ -19,8 +20,9 @@ bot = logging.getLogger("rse.main.criteria")
 parser_regex = "github"
 
 
+@functools.lru_cache(maxsize=1)
 def get_criteria():
-    """Get criteria from the default endpoint."""
+    """Get criteria from the default endpoint, once per session."""
     response = requests.get(f"{RSE_API_ENDPOINT}/criteria/")
     if response.status_code != 200:
         sys.exit(f"Problem with getting {RSE_API_ENDPOINT}/criteria/")
@@ -28,6 +28,14 @@ class Database:
         """
         raise NotImplementedError
 
+    def get_many(self, uids):
+        """
+        get software repositories for a list of uids, one at a time. Databases
+        that can retrieve a batch of repositories at once should override this.
+        """
+        for uid in uids:
+            yield self.get(uid)
+
     def exists(self):
         """
         determine if a software repository exists in the database.
@@ -73,6 +81,6 @@ class Database:
     def list_repos(self, name=None):
         """
         list software repositories, either under a particular parser name
-        or just under all parsers.
+        or just under all parsers. This should yield one uid per repo.
         """
         raise NotImplementedError
@@ -166,13 +166,13 @@ class FileSystemDatabase(Database):
         for repo in self.list_repos():
 
             if query:
-                if re.search(query, repo[0], re.IGNORECASE):
+                if re.search(query, repo, re.IGNORECASE):
                     if query not in results:
                         results[query] = set()
-                    results[query].add(repo[0])
+                    results[query].add(repo)
 
             if taxonomy or criteria:
-                repo = self.get(repo[0])
+                repo = self.get(repo)
 
             # Add taxonomy items
             if taxonomy:
@@ -242,22 +242,18 @@ class FileSystemDatabase(Database):
     def list_repos(self, name=None):
         """
         list software repositories, either under a particular parser name
-        or just under all parsers. This returns repos in rows to be printed
-        (or otherwise parsed).
+        or just under all parsers. This yields the unique id for each repo,
+        one at a time, as the database folder is walked.
         """
         listpath = self.data_base
         if name:
             listpath = os.path.join(listpath, name)
-        rows = []
         for filename in recursive_find(listpath, pattern="metadata*.json"):
-            rows.append(
-                [
-                    filename.replace("metadata.json", "")
-                    .replace(self.data_base, "")
-                    .strip("/")
-                ]
+            yield (
+                filename.replace("metadata.json", "")
+                .replace(self.data_base, "")
+                .strip("/")
             )
-        return rows
 
 
 class SoftwareRepository:
@@ -10,6 +10,7 @@ with this file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 import json
 import logging
+from itertools import islice
 
 from sqlalchemy import create_engine, desc, or_
 from sqlalchemy.orm import scoped_session, sessionmaker
@@ -219,6 +220,32 @@ class RelationalDatabase(Database):
         repo.parser = parser
         return repo
 
+    def get_many(self, uids, chunk_size=500):
+        """
+        Get repos for a list of uids, selecting them in batches (chunk_size at
+        a time) instead of one query per uid. Repos are yielded in the order
+        of uids, and a uid without an exact match falls back to get.
+        """
+        from rse.main.database.models import SoftwareRepository
+
+        uids = iter(uids)
+        chunk = list(islice(uids, chunk_size))
+        while chunk:
+            repos = {
+                repo.uid: repo
+                for repo in SoftwareRepository.query.filter(
+                    SoftwareRepository.uid.in_(chunk)
+                )
+            }
+            for uid in chunk:
+                repo = repos.get(uid)
+                if repo is None:
+                    yield self.get(uid)
+                    continue
+                repo.parser = get_parser(repo.uid, config=self.config)
+                yield repo
+            chunk = list(islice(uids, chunk_size))
+
     def delete_repo(self, uid):
         """
         delete a repo based on a specific repo id.
@@ -252,21 +279,15 @@ class RelationalDatabase(Database):
     def list_repos(self, name=None):
         """
         list repos, either under a particular parser name (if provided)
-        or just the parsers.
+        or just the parsers. This yields the unique id for each repo.
         """
         from rse.main.database.models import SoftwareRepository
 
+        query = self.session.query(SoftwareRepository.uid)
         if name:
-            repos = SoftwareRepository.query.filter(
-                SoftwareRepository.parser_name == name
-            )
-        else:
-            repos = SoftwareRepository.query.all()
-
-        rows = []
-        for repo in repos:
-            rows.append([repo.uid])
-        return rows
+            query = query.filter(SoftwareRepository.parser_name == name)
+        for row in query:
+            yield row[0]
 
     def search(self, query, taxonomy=None, criteria=None):
         """
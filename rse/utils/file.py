@@ -53,6 +53,18 @@ def read_file(filename, readlines=True):
     return content
 
 
+def stream_file(filename):
+    """stream_file will open a file, "filename" and yield one line at a time,
+    so the whole file is never held in memory.
+
+    Arguments:
+      - filename (str) : the filename to read
+    """
+    with open(filename, "r") as filey:
+        for line in filey:
+            yield line
+
+
 def write_file(content, filename):
     """
     Write some text content to a file
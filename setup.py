@@ -117,5 +117,5 @@ if __name__ == "__main__":
             "Programming Language :: Python :: 3.7",
             "Programming Language :: Python :: 3.8",
         ],
-        entry_points={"console_scripts": ["rse=rse.client:main"]},
+        entry_points={"console_scripts": ["rse=rse.cli.__main__:main"]},
     )
@@ -0,0 +1,101 @@
+"""
+
+Copyright (C) 2020-2022 Vanessa Sochat.
+
+This Source Code Form is subject to the terms of the
+Mozilla Public License, v. 2.0. If a copy of the MPL was not distributed
+with this file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+
+import sys
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["get"],
+        ["get", "github.com/rseng/rse"],
+        ["--config_file", "rse.ini", "exists", "github.com/rseng/rse"],
+        ["--log_level=DEBUG", "add", "--file", "repos.txt"],
+        ["update", "--rewrite", "github.com/rseng/rse", "--database=sqlite"],
+        ["update", "-p", "software", "--force"],
+    ],
+)
+def test_fast_parse(monkeypatch, argv):
+    """Test that parsing common commands by hand matches argparse."""
+    from rse.cli.__main__ import _fast_parse, get_parser
+
+    monkeypatch.setattr(sys, "argv", ["rse"] + argv)
+    args, extra = get_parser().parse_known_args()
+    assert not extra
+    assert _fast_parse(argv) == args
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["ls"],
+        ["--version", "get"],
+        ["get", "--help"],
+        ["get", "--he"],
+        ["--hel", "get"],
+        ["update", "-fh"],
+        ["update", "--path", "-h"],
+        ["get", "--config_file", "rse.ini"],
+        ["get", "--database", "postgresql"],
+        ["update", "one", "two"],
+        ["--log_level", "LOUD", "get"],
+    ],
+)
+def test_fast_parse_fallback(argv):
+    """Test that anything out of the ordinary is left to argparse."""
+    from rse.cli.__main__ import _fast_parse
+
+    assert _fast_parse(argv) is None
+
+
+def test_get_parser_cached(monkeypatch):
+    """Test that the parser is cached for each subcommand."""
+    from rse.cli.__main__ import _reset_cached_parser, get_parser
+
+    monkeypatch.setattr(sys, "argv", ["rse", "get"])
+    parser = get_parser()
+    assert get_parser() is parser
+
+    monkeypatch.setattr(sys, "argv", ["rse", "ls"])
+    assert get_parser() is not parser
+
+    monkeypatch.setattr(sys, "argv", ["rse", "get"])
+    _reset_cached_parser()
+    assert get_parser() is not parser
+
+
+@pytest.mark.parametrize(
+    "argv,command",
+    [
+        (["get", "uid"], "get"),
+        (["--log_level", "DEBUG", "ls"], "ls"),
+        (["--he", "ls"], None),
+        (["-vh", "ls"], None),
+    ],
+)
+def test_sniff_subcommand(argv, command):
+    """Test that the subcommand is found, unless help comes before it."""
+    from rse.cli.__main__ import _sniff_subcommand
+
+    assert _sniff_subcommand(argv) == command
+
+
+@pytest.mark.parametrize("flag", ["--he", "--hel", "-h"])
+def test_get_parser_abbreviated_help(monkeypatch, capsys, flag):
+    """Test that an abbreviated help flag shows help instead of running."""
+    from rse.cli.__main__ import get_parser
+
+    monkeypatch.setattr(sys, "argv", ["rse", "ls", flag])
+    with pytest.raises(SystemExit) as error:
+        get_parser().parse_known_args()
+    assert error.value.code == 0
+    assert "-h, --help" in capsys.readouterr().out
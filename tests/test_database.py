@@ -75,11 +75,11 @@ def test_filesystem(tmp_path, database):
         assert enc.db.data_base == os.path.join(config_dir, "database")
 
     # Test list, empty without anything
-    assert not enc.list()
+    assert not list(enc.list())
 
     # Add a repo
     repo = enc.add("github.com/singularityhub/sregistry")
-    assert len(enc.list()) == 1
+    assert len(list(enc.list())) == 1
 
     # enc.get should return last repo, given no id
     lastrepo = enc.get()
@@ -93,10 +93,30 @@ def test_filesystem(tmp_path, database):
 
     # Clean up a specific repo (no prompt)
     enc.clear(repo.uid, noprompt=True)
-    assert len(enc.list()) == 0
+    assert len(list(enc.list())) == 0
     enc.clear(noprompt=True)
-    assert not enc.list()
+    assert not list(enc.list())
 
     # Get the taxonomy or criteria
     enc.list_taxonomy()
     enc.list_criteria()
+
+
+@pytest.mark.parametrize("database", ["filesystem", "sqlite"])
+def test_get_many(tmp_path, database):
+    """Test retrieving a batch of repos, in the order requested."""
+    from rse.main import Encyclopedia
+
+    config_dir = os.path.join(str(tmp_path), "software")
+    os.mkdir(config_dir)
+    config_file = os.path.join(config_dir, "rse.ini")
+    enc = Encyclopedia(config_file=config_file, generate=True, database=database)
+
+    # Providing data means we don't need to retrieve metadata
+    for uid in ["github.com/rseng/rse", "github.com/rseng/rseng"]:
+        enc.add(uid, data={"full_name": uid})
+
+    uids = ["github/rseng/rseng", "github/rseng/rse"]
+    repos = list(enc.db.get_many(uids))
+    assert [repo.uid for repo in repos] == uids
+    assert all(repo.parser.name == "github" for repo in repos)